@@ -280,6 +280,13 @@ https://pyomicron.readthedocs.io/en/latest/"""
     # max concurrent omicron jobs
     procg.add_argument('--max-concurrent', default=10, type=int,
                        help='Max omicron jobs at one time [%(default)s]')
+    procg.add_argument(
+        '--nproc',
+        type=int,
+        default=1,
+        help='number of parallel processes to use when finding and reading '
+             'state-vector data (default: %(default)s)',
+    )
     procg.add_argument(
         '-x',
         '--exclude-channel',
@@ -795,6 +802,7 @@ def main(args=None):
                 stateft,
                 datastart,
                 dataend,
+                nproc=args.nproc,
                 pad=statepad,
             )
         else:
@@ -805,6 +813,7 @@ def main(args=None):
                 datastart,
                 dataend,
                 bits=statebits,
+                nproc=args.nproc,
                 pad=statepad,
             )
         logger.info(f'State query took {time.time() - seg_qry_strt:.2f}s')
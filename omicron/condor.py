@@ -42,6 +42,7 @@ from glue import pipeline
 from gwpy.time import to_gps
 
 re_dagman_cluster = re.compile(r'(?<=submitted\sto\scluster )[0-9]+')
+re_requirements = re.compile(r'(?m)(?<=^Requirements = ).+(\n +.+)*')
 
 JOB_STATUS = [
     'Unexpanded',
@@ -602,8 +603,7 @@ class OmicronProcessJob(pipeline.CondorDAGJob):
         if self.singularity_image:
             # check if there are existing requirements
             prefix = "Requirements = "
-            pattern = re.compile(rf"(?m)(?<=^{prefix}).+(\n +.+)*")
-            requirements = pattern.search(sub)
+            requirements = re_requirements.search(sub)
             if requirements is None:
                 # if not, just add singularity as the sole
                 # requirement at the top of the sub file
@@ -616,7 +616,7 @@ class OmicronProcessJob(pipeline.CondorDAGJob):
                 requirements += " && \\\n"
                 requirements += " " * len(prefix)
                 requirements += "HasSingularity"
-                sub = pattern.sub(requirements, sub)
+                sub = re_requirements.sub(requirements, sub)
 
             # finally specify the image path at the
             # top of the sub file
@@ -24,6 +24,9 @@ import glob
 import re
 import shutil
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -41,6 +44,13 @@ AGGREGATED_HOFT = {  # map aggregated h(t) type to short h(t) type
     'V1Online': 'V1_llhoft',
 }
 
+# shortest GPS interval to query per thread when searching in parallel
+DATAFIND_MIN_SPAN = 86400
+
+# most recent find_frames results, keyed on the query
+_FRAMES_CACHE = OrderedDict()
+_FRAMES_CACHE_SIZE = 64
+
 
 # -- utilities ----------------------------------------------------------------
 
@@ -50,6 +60,34 @@ def path_from_file_url(url):
     return urlparse(url).path
 
 
+@lru_cache(maxsize=4096)
+def _existing_file(path):
+    # lru_cache does not store exceptions, so only paths that were found
+    # to exist are cached, missing paths are checked again on every call
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+    return path
+
+
+def _isfile(path):
+    """Return `True` if ``path`` is an existing file
+
+    Up to 4096 paths found to exist are remembered to avoid repeatedly
+    stat-ing the same frame files, missing files are always checked again
+    as they may be written later. Files in low-latency buffers may be
+    deleted after they were found, long-running processes should call
+    ``_isfile.cache_clear()`` to forget them.
+    """
+    try:
+        _existing_file(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+_isfile.cache_clear = _existing_file.cache_clear
+
+
 def _find_more_files(path):
     """Find more files similar to ``path`` by incrementing the GPS times
 
@@ -84,7 +122,7 @@ def _find_more_files(path):
             new = new.replace('{start5}/'.format(start5=str(s)[:ngps]),
                               '{end5}/'.format(end5=str(e)[:ngps]))
             # if this file doesn't exist, the previous file is what we want
-            if not os.path.isfile(new):
+            if not _isfile(new):
                 return found
             # otherwise keep going
             found.append(new)
@@ -149,7 +187,8 @@ def write_cache(cache, outfile):
 
 # -- find files ---------------------------------------------------------------
 
-def find_frames(obs, frametype, start, end, on_gaps='warn', **kwargs):
+def find_frames(obs, frametype, start, end, on_gaps='warn', nproc=1,
+                **kwargs):
     """Find all frames for the given frametype in the GPS interval
 
     Parameters
@@ -162,6 +201,9 @@ def find_frames(obs, frametype, start, end, on_gaps='warn', **kwargs):
         the GPS start time of this search
     end : `int`
         the GPS end time of this search
+    nproc : `int`, optional
+        the number of threads with which to query the datafind server,
+        long intervals are split into at most this many sub-intervals
     **kwargs
         all other keyword arguments are passed directly to
         :func:`~gwdatafind.find_urls`
@@ -170,12 +212,51 @@ def find_frames(obs, frametype, start, end, on_gaps='warn', **kwargs):
     -------
     paths : `list` of `str`
         a list of GWF file pths
+
+    Notes
+    -----
+    Results of the last 64 searches are cached for the lifetime of the
+    process, except when ``tmpdir`` is given, use
+    ``find_frames.cache_clear()`` to discard them. Missing frames are
+    checked for on every call.
     """
+    if kwargs.get('tmpdir'):  # files are copied, so always search afresh
+        cache = _find_frames(obs, frametype, start, end, nproc=nproc,
+                             **kwargs)
+    else:
+        # nproc doesn't change the result, so isn't part of the key
+        key = (obs, frametype, start, end, tuple(sorted(kwargs.items())))
+        try:
+            _FRAMES_CACHE.move_to_end(key)
+        except KeyError:
+            _FRAMES_CACHE[key] = tuple(_find_frames(
+                obs, frametype, start, end, nproc=nproc, **kwargs))
+            if len(_FRAMES_CACHE) > _FRAMES_CACHE_SIZE:
+                _FRAMES_CACHE.popitem(last=False)
+        cache = list(_FRAMES_CACHE[key])
+
+    # handle missing files
+    if on_gaps != 'ignore':
+        seglist = SegmentList(map(file_segment, cache)).coalesce()
+        missing = (SegmentList([Segment(start, end)]) - seglist).coalesce()
+        msg = "Missing frames:\n{}".format('\n'.join(map(lambda s: f'[{s[0]}, {s[1]}) -> {s[1]-s[0]}s', missing)))
+        if missing and on_gaps == 'warn':
+            warnings.warn(msg)
+        elif missing:
+            raise RuntimeError(msg)
+
+    return cache
+
+
+find_frames.cache_clear = _FRAMES_CACHE.clear
+
+
+def _find_frames(obs, frametype, start, end, nproc=1, **kwargs):
     ll_kw = {key: kwargs.pop(key) for key in ('tmpdir', 'root',) if
              key in kwargs}
 
     cache = _find_frames_datafind(obs, frametype, start, end, on_gaps='ignore',
-                                  **kwargs)
+                                  nproc=nproc, **kwargs)
 
     # find more files for low-latency under /dev/shm (or similar)
     if re_ll.search(frametype):
@@ -186,24 +267,32 @@ def find_frames(obs, frametype, start, end, on_gaps='warn', **kwargs):
         if latest < end:
             cache.extend(find_ll_frames(obs, frametype, latest, end, **ll_kw))
 
-    # handle missing files
-    if on_gaps != 'ignore':
-        seglist = SegmentList(map(file_segment, cache)).coalesce()
-        missing = (SegmentList([Segment(start, end)]) - seglist).coalesce()
-        msg = "Missing frames:\n{}".format('\n'.join(map(lambda s: f'[{s[0]}, {s[1]}) -> {s[1]-s[0]}s', missing)))
-        if missing and on_gaps == 'warn':
-            warnings.warn(msg)
-        elif missing:
-            raise RuntimeError(msg)
-
     return cache
 
 
-def _find_frames_datafind(obs, frametype, start, end, **kwargs):
+def _find_urls(obs, frametype, start, end, nproc=1, **kwargs):
+    """Query datafind for URLs, splitting long intervals across threads
+    """
+    nsplit = int(min(nproc, (end - start) // DATAFIND_MIN_SPAN))
+    if nsplit <= 1:
+        return gwdatafind.find_urls(obs, frametype, start, end, **kwargs)
+
+    step = (end - start) / nsplit
+    edges = [start] + [int(start + i * step) for i in range(1, nsplit)] + [end]
+    with ThreadPoolExecutor(max_workers=nsplit) as pool:
+        results = pool.map(
+            lambda seg: gwdatafind.find_urls(obs, frametype, *seg, **kwargs),
+            zip(edges[:-1], edges[1:]),
+        )
+        # files spanning an edge are returned for both sub-intervals
+        return list(dict.fromkeys(url for urls in results for url in urls))
+
+
+def _find_frames_datafind(obs, frametype, start, end, nproc=1, **kwargs):
     kwargs.setdefault('urltype', 'file')
     cache = list(map(
         path_from_file_url,
-        gwdatafind.find_urls(obs[0], frametype, start, end, **kwargs),
+        _find_urls(obs[0], frametype, start, end, nproc=nproc, **kwargs),
     ))
 
     # use latest frame to find more recent frames that aren't in
@@ -225,6 +314,7 @@ def _find_frames_datafind(obs, frametype, start, end, **kwargs):
             AGGREGATED_HOFT[frametype],
             latestgps,
             end,
+            nproc=nproc,
             **kwargs
         ))
 
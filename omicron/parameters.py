@@ -27,6 +27,8 @@ from datetime import datetime
 from getpass import getuser
 from math import (ceil, exp, floor, log)
 
+import numpy
+
 from ligo.segments import (segmentlist as SegmentList, segment as Segment)
 
 from . import (const, utils)
@@ -333,7 +335,6 @@ class OmicronParameters(configparser.ConfigParser):
             "bound, Omicron needs at least %ds. Minimum lower-frequency bound "
             "for this chunk duration is %.2gHz" % (2 * psdlen + overlap, flow))
 
-    @integer_segments
     def output_segments(self, start, end):
         """Prints the list of processing segments for a given data segment
         """
@@ -343,14 +344,15 @@ class OmicronParameters(configparser.ConfigParser):
         padding = overlap / 2.
 
         # build list of file segments
-        t = start + padding
         stop = end - padding
-        segments = SegmentList()
-        while t < stop:
-            e = min(t + fileduration, stop)
-            segments.append(Segment(t, e))
-            t = e
-        return segments
+        starts = numpy.arange(start + padding, stop, fileduration)
+        ends = numpy.minimum(starts + fileduration, stop)
+        # truncate to integers in bulk, rather than rebuilding every segment
+        return SegmentList(map(
+            Segment,
+            starts.astype(int).tolist(),
+            ends.astype(int).tolist(),
+        ))
 
     @integer_segments
     def distribute_segment(self, start, end, nperjob=1):
@@ -386,21 +388,16 @@ class OmicronParameters(configparser.ConfigParser):
         if end - start <= chunk * 2:
             return SegmentList([Segment(start, end)])
 
-        # multiple larger segments
-        out = SegmentList()
-        t = start
-        while t < end - overlap:
-            seg = Segment(t, t)
-            c = chunk
-            while abs(seg) < chunk * nperjob and seg[1] < end:
-                seg = Segment(seg[0], min(seg[1] + c, end))
-                c = chunk - overlap
-            if abs(seg) < chunk:
-                out[-1] += seg
-            else:
-                out.append(seg)
-            t = seg[1] - overlap
-        return out
+        # multiple larger segments, each job is one chunk plus as many
+        # overlapping chunks as needed to reach `nperjob` chunks in total
+        step = chunk - overlap
+        duration = chunk + ceil(chunk * (nperjob - 1) / step) * step
+        starts = numpy.arange(start, end - overlap, duration - overlap)
+        ends = numpy.minimum(starts + duration, end)
+        # fold a trailing segment shorter than one chunk into the last job
+        if ends[-1] - starts[-1] < chunk:
+            starts, ends = starts[:-1], numpy.r_[ends[:-2], ends[-1]]
+        return SegmentList(map(Segment, starts, ends))
 
     def output_formats(self):
         return [fmt for fmt in ('root', 'txt', 'xml', 'hdf5') if
@@ -19,23 +19,29 @@
 """Segment utilities for Omicron
 """
 
+import os
 import re
+import warnings
 from functools import wraps
 from math import (floor, ceil)
+from pathlib import Path
+from types import MappingProxyType
+
+import numpy
 
 from igwn_auth_utils.requests import get as igwn_get
 
 from dqsegdb2.query import DEFAULT_SEGMENT_SERVER
 
-from gwpy.io.cache import (cache_segments as _cache_segments, file_segment)
+from gwpy.io.cache import file_segment
 from gwpy.io.gwf import data_segments as gwf_data_segments
 from gwpy.segments import (DataQualityFlag, Segment, SegmentList)
 from gwpy.timeseries import (StateTimeSeries, StateVector, TimeSeriesDict)
 
 from . import data
 
-STATE_CHANNEL = {
-    # each value of this dict is a 3-tuple:
+STATE_CHANNEL = MappingProxyType({
+    # each value of this mapping is a 3-tuple:
     #     channel name or guardian node prefix
     #     state bits (or 'guardian')
     #     state frametype
@@ -110,8 +116,13 @@ STATE_CHANNEL = {
         [0, 1, 2],
         "V1Online",
     ),
-}
+})
 RAW_TYPE_REGEX = re.compile(r'[A-Z]1_R')
+# GPS start and duration of LIGO-T050017 file names, one path per line
+FILE_SEGMENT_REGEX = re.compile(
+    r'-(\d+(?:\.\d+)?)-(\d+(?:\.\d+)?)\.(?=[^\d\n/])[^\n/]*$',
+    re.M,
+)
 
 
 def integer_segments(f):
@@ -122,7 +133,46 @@ def integer_segments(f):
     return decorated_method
 
 
+def _as_uint32(series):
+    """Return ``series`` as `uint32` data, without copying if possible
+
+    32-bit integer data are reinterpreted in place, which is bit-for-bit
+    identical to a cast, anything else is cast to a new array.
+    """
+    if series.dtype.kind in 'iu' and series.dtype.itemsize == 4:
+        return series.view('uint32')
+    return series.astype('uint32')
+
+
+def _read_integer_segments(source):
+    """Parse an integer segwizard table in one go with `numpy.loadtxt`
+    """
+    # numpy only uses its C parser with a single comment character
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", "loadtxt: input contained no data")
+        table = numpy.loadtxt(source, comments='#', ndmin=2)
+    if not table.size:
+        return SegmentList()
+    # columns are ([index,] start, end, duration) or (start, end)
+    if table.shape[1] > 2:
+        bounds = table[:, -3:-1]
+        if ((bounds[:, 1] - bounds[:, 0]) != table[:, -1]).any():
+            raise ValueError("segment durations do not match [start, end)")
+    else:
+        bounds = table
+    return SegmentList(map(Segment, *bounds.astype(int).T.tolist()))
+
+
 def read_segments(source, coltype=int):
+    """Read a list of segments from a segwizard-format file
+    """
+    if coltype is int:
+        pos = None if isinstance(source, (str, Path)) else source.tell()
+        try:
+            return _read_integer_segments(source)
+        except ValueError:  # e.g. ';' comments, let gwpy handle it
+            if pos is not None:
+                source.seek(pos)
     return SegmentList.read(
         source,
         gpstype=coltype,
@@ -130,16 +180,54 @@ def read_segments(source, coltype=int):
     )
 
 
-def get_last_run_segment(segfile):
-    return read_segments(segfile, coltype=int)[-1]
+def get_last_run_segment(segfile, blocksize=4096):
+    """Return the last segment recorded in a segwizard-format file
+
+    For file paths only the end of the file is read, rather than parsing
+    the whole table.
+    """
+    if not isinstance(segfile, (str, Path)):
+        return read_segments(segfile, coltype=int)[-1]
+
+    with open(segfile, 'rb') as fp:
+        size = fp.seek(0, os.SEEK_END)
+        while True:
+            offset = max(size - blocksize, 0)
+            fp.seek(offset)
+            lines = fp.read().splitlines()
+            if offset:  # first line is probably incomplete
+                lines = lines[1:]
+            for line in reversed(lines):
+                tokens = line.split()
+                if tokens and not tokens[0].startswith((b'#', b';')):
+                    # columns are ([index,] start, end, duration) or (start, end)
+                    if len(tokens) > 2:
+                        start, end = map(float, tokens[-3:-1])
+                        if float(tokens[-1]) != end - start:
+                            raise ValueError(
+                                "segment durations do not match [start, end)")
+                        tokens = tokens[-3:-1]
+                    return Segment(*(int(float(t)) for t in tokens))
+            if not offset:
+                raise IndexError("no segments found in {}".format(segfile))
+            blocksize *= 2
 
 
 def write_segments(segmentlist, outfile, coltype=int):
-    return SegmentList(segmentlist).write(
-        outfile,
-        coltype=coltype,
-        format="segwizard",
-    )
+    """Write a list of segments to a segwizard-format file
+    """
+    if isinstance(outfile, (str, Path)):
+        with open(outfile, 'w') as fp:
+            return write_segments(segmentlist, fp, coltype=coltype).name
+
+    # format all rows up front and write them in a single call
+    rows = ['# seg\tstart\tstop\tduration']
+    for i, seg in enumerate(segmentlist):
+        a = coltype(seg[0])
+        b = coltype(seg[1])
+        rows.append('{0}\t{1}\t{2}\t{3}'.format(i, a, b, float(b - a)))
+    outfile.write('\n'.join(rows) + '\n')
+    return outfile
 
 
 @integer_segments
@@ -154,7 +242,7 @@ def query_state_segments(flag, start, end, url=DEFAULT_SEGMENT_SERVER,
 
 
 @integer_segments
-def get_state_segments(channel, frametype, start, end, bits=[0], nproc=1,
+def get_state_segments(channel, frametype, start, end, bits=(0,), nproc=1,
                        pad=(0, 0)):
     """Read state segments from a state-vector channel in the frames
     """
@@ -163,7 +251,7 @@ def get_state_segments(channel, frametype, start, end, bits=[0], nproc=1,
     pend = end + pad[1]
 
     # find frame cache
-    cache = data.find_frames(ifo, frametype, pstart, pend)
+    cache = data.find_frames(ifo, frametype, pstart, pend, nproc=nproc)
 
     # optimise I/O based on type and library
     io_kw = {}
@@ -178,7 +266,7 @@ def get_state_segments(channel, frametype, start, end, bits=[0], nproc=1,
         elif channel.endswith('GDS-CALIB_STATE_VECTOR'):
             io_kw['type'] = 'proc'
 
-    bits = list(map(str, bits))
+    bits = tuple(map(str, bits))
     # FIXME: need to read from cache with single segment but doesn't match
     # [start, end)
 
@@ -195,9 +283,9 @@ def get_state_segments(channel, frametype, start, end, bits=[0], nproc=1,
     except KeyError:
         return segs
     for seg in csegs & span:
-        sv = StateVector.read(cache, channel, nproc=nproc, start=seg[0],
-                              end=seg[1], bits=bits, gap='pad', pad=0,
-                              **io_kw).astype('uint32')
+        sv = _as_uint32(StateVector.read(
+            cache, channel, nproc=nproc, start=seg[0], end=seg[1],
+            bits=bits, gap='pad', pad=0, **io_kw))
         segs += sv.to_dqflags().intersection().active
 
     # truncate to integers, and apply padding
@@ -228,7 +316,7 @@ def get_guardian_segments(node, frametype, start, end, nproc=1, pad=(0, 0),
     pend = end + pad[1]
 
     # find frame cache
-    cache = data.find_frames(ifo, frametype, pstart, pend)
+    cache = data.find_frames(ifo, frametype, pstart, pend, nproc=nproc)
 
     # pre-format data segments
     span = SegmentList([Segment(pstart, pend)])
@@ -248,9 +336,9 @@ def get_guardian_segments(node, frametype, start, end, nproc=1, pad=(0, 0),
         channels = [state, nominal, active]
     for seg in csegs & span:
         if strict:
-            sv = StateVector.read(
+            sv = _as_uint32(StateVector.read(
                 cache, channels[0], nproc=nproc, start=seg[0], end=seg[1],
-                bits=[0], gap='pad', pad=0,).astype('uint32')
+                bits=[0], gap='pad', pad=0,))
             segs += sv.to_dqflags().intersection().active
         else:
             gdata = TimeSeriesDict.read(
@@ -270,18 +358,76 @@ def get_guardian_segments(node, frametype, start, end, nproc=1, pad=(0, 0),
     return segs.coalesce()
 
 
+def _coalesce_bounds(starts, ends):
+    """Merge overlapping or touching ``[start, end)`` intervals
+
+    Returns the ``(starts, ends)`` arrays of the coalesced intervals, in
+    time order.
+    """
+    starts = numpy.asarray(starts)
+    ends = numpy.asarray(ends)
+    if not starts.size:
+        return starts, ends
+    if (starts[1:] < starts[:-1]).any():  # frame caches are normally sorted
+        order = numpy.argsort(starts, kind='stable')
+        starts = starts[order]
+        ends = ends[order]
+    # a new interval begins wherever a start time lies beyond the
+    # latest end time seen so far
+    reach = numpy.maximum.accumulate(ends)
+    first = numpy.flatnonzero(numpy.r_[True, starts[1:] > reach[:-1]])
+    last = numpy.r_[first[1:] - 1, starts.size - 1]
+    return starts[first], reach[last]
+
+
+def _cache_bounds(cache):
+    """Return the coalesced ``(starts, ends)`` arrays covered by a cache
+
+    File names are parsed in a single regular expression pass, rather than
+    building a `Segment` per file, anything else (e.g. a
+    :class:`~lal.utils.CacheEntry`) is handled by `file_segment`.
+    """
+    cache = list(cache)
+    found = []
+    if all(isinstance(e, str) for e in cache):
+        found = FILE_SEGMENT_REGEX.findall('\n'.join(cache))
+    if len(found) == len(cache):
+        table = numpy.array(found, dtype=float).reshape(-1, 2)
+        starts, ends = table[:, 0], table[:, 0] + table[:, 1]
+    else:
+        bounds = numpy.array(list(map(file_segment, cache))).reshape(-1, 2)
+        starts, ends = bounds[:, 0], bounds[:, 1]
+    return _coalesce_bounds(starts, ends)
+
+
 @integer_segments
 def cache_segments(cache):
-    return _cache_segments(cache).coalesce()
+    starts, ends = _cache_bounds(cache)
+    return SegmentList(map(Segment, starts.tolist(), ends.tolist()))
 
 
 def segmentlist_from_tree(tree, coalesce=False):
     """Read a `~ligo.segments.segmentlist` from a 'segments' `ROOT.Tree`
     """
     segs = SegmentList()
-    for i in range(tree.GetEntries()):
-        tree.GetEntry(i)
-        segs.append(Segment(tree.start, tree.end))
+    nentries = tree.GetEntries()
+    if not nentries:
+        return segs
+
+    # only read the branches we need for each entry, then restore the
+    # caller's branch status (TChain.Merge drops inactive branches)
+    status = {branch.GetName(): tree.GetBranchStatus(branch.GetName())
+              for branch in tree.GetListOfBranches()}
+    try:
+        tree.SetBranchStatus("*", 0)
+        tree.SetBranchStatus("start", 1)
+        tree.SetBranchStatus("end", 1)
+        for i in range(nentries):
+            tree.GetEntry(i)
+            segs.append(Segment(tree.start, tree.end))
+    finally:
+        for name, active in status.items():
+            tree.SetBranchStatus(name, active)
     return segs
 
 
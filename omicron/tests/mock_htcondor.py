@@ -19,15 +19,8 @@ class Schedd(object):
                 break
             else:
                 x[a] = eval(b)
-        match = []
-
-        def match(job):
-            for key in x:
-                if x[key] != job[key]:
-                    return False
-            return True
-
-        return iter(filter(match, self._jobs))
+        return (job for job in self._jobs if
+                all(job[key] == val for key, val in x.items()))
 
     def history(self, *args, **kwargs):
         return
@@ -44,28 +44,39 @@ def mock_schedd_factory(jobs):
     return Schedd
 
 
+@pytest.fixture(scope='module')
+def _submit_mocks():
+    # patch once for the whole module, rather than once per test
+    with mock.patch('omicron.condor.find_executable',
+                    return_value=sys.executable), \
+         mock.patch('omicron.condor.check_output') as shell:
+        yield shell
+
+
+@pytest.fixture
+def shell(_submit_mocks):
+    _submit_mocks.reset_mock(return_value=True)
+    _submit_mocks.return_value = b'1 job(s) submitted to cluster 12345'
+    return _submit_mocks
+
+
 # -- tests --------------------------------------------------------------------
 
-@mock.patch('omicron.condor.find_executable', return_value=sys.executable)
-@mock.patch('omicron.condor.check_output',
-            return_value=b'1 job(s) submitted to cluster 12345')
-def test_submit_dag(shell, which):
+def test_submit_dag(shell):
     dagid = condor.submit_dag('test.dag')
     assert dagid == 12345
 
 
-@mock.patch('omicron.condor.find_executable', return_value=sys.executable)
-@mock.patch('omicron.condor.check_output',
-            return_value=b'1 job(s) submitted to cluster 12345')
-def test_submit_dag_append(shell, which):
+def test_submit_dag_append(shell):
     condor.submit_dag('test.dag', '-append', '+OmicronDAGMan="GW"')
-    assert shell.called_with([sys.executable, '-append',
-                              '+OmicronDAGMan="GW"', 'test.dag'])
+    shell.assert_called_once_with(
+        [sys.executable, '-append', '+OmicronDAGMan="GW"', 'test.dag'],
+        env=os.environ,
+    )
 
 
-@mock.patch('omicron.condor.find_executable', return_value=sys.executable)
-@mock.patch('omicron.condor.check_output', return_value=b'Something else')
-def test_submit_dag_error(shell, which):
+def test_submit_dag_error(shell):
+    shell.return_value = b'Something else'
     with pytest.raises(AttributeError) as exc:
         condor.submit_dag('test.dag')
     assert str(exc.value).startswith('Failed to extract DAG cluster ID')
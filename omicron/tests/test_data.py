@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) Duncan Macleod (2016)
+#
+# This file is part of PyOmicron.
+#
+# PyOmicron is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyOmicron is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with PyOmicron.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for omicron.data
+"""
+
+import os.path
+from unittest import mock
+
+import pytest
+
+from .. import data
+
+
+def test_isfile(tmp_path):
+    data._isfile.cache_clear()
+    path = tmp_path / "X-TEST-0-1.gwf"
+
+    # missing files are checked again on every call
+    with mock.patch("os.path.isfile", wraps=os.path.isfile) as isfile:
+        assert not data._isfile(str(path))
+        path.touch()
+        assert data._isfile(str(path))
+        assert isfile.call_count == 2
+
+        # known files are not stat'ed again
+        assert data._isfile(str(path))
+        assert isfile.call_count == 2
+
+    # until the cache is cleared
+    path.unlink()
+    assert data._isfile(str(path))
+    data._isfile.cache_clear()
+    assert not data._isfile(str(path))
+
+
+def _fake_find_urls(obs, frametype, start, end, **kwargs):
+    # one 4096-second file per stride, including files straddling the edges
+    first = int(start) - int(start) % 4096
+    return ["file://localhost/{0}-{1}-{2}-4096.gwf".format(obs, frametype, t)
+            for t in range(first, int(end), 4096)]
+
+
+def test_find_urls_parallel():
+    start = 1000000000
+    end = start + 4 * data.DATAFIND_MIN_SPAN + 100
+    with mock.patch("gwdatafind.find_urls",
+                    side_effect=_fake_find_urls) as find_urls:
+        urls = data._find_urls("X", "X1_R", start, end, nproc=8)
+
+    # span only allows 4 sub-intervals, on integer edges
+    edges = sorted(call.args[2:4] for call in find_urls.call_args_list)
+    assert len(edges) == 4
+    assert edges[0][0] == start and edges[-1][1] == end
+    for (_, e1), (s2, _) in zip(edges[:-1], edges[1:]):
+        assert e1 == s2 and isinstance(e1, int)
+
+    # results are ordered and files straddling an edge appear once
+    assert urls == _fake_find_urls("X", "X1_R", start, end)
+
+
+def test_find_urls_serial():
+    start = 1000000000
+    end = start + data.DATAFIND_MIN_SPAN + 100
+    with mock.patch("gwdatafind.find_urls",
+                    side_effect=_fake_find_urls) as find_urls:
+        urls = data._find_urls("X", "X1_R", start, end, nproc=8)
+    find_urls.assert_called_once_with("X", "X1_R", start, end)
+    assert urls == _fake_find_urls("X", "X1_R", start, end)
+
+
+@pytest.fixture
+def find_urls():
+    data.find_frames.cache_clear()
+    with mock.patch(
+        "gwdatafind.find_urls",
+        return_value=["file://localhost/path/to/X-X1_R-0-10.gwf"],
+    ) as find_urls:
+        yield find_urls
+    data.find_frames.cache_clear()
+
+
+def test_find_frames_cache(find_urls):
+    first = data.find_frames("X", "X1_R", 0, 10)
+    first.append("/path/to/X-X1_R-10-10.gwf")
+
+    # a hit doesn't query again, and returns an independent list
+    second = data.find_frames("X", "X1_R", 0, 10, nproc=4)
+    assert find_urls.call_count == 1
+    assert second == ["/path/to/X-X1_R-0-10.gwf"]
+
+    # a different query does
+    data.find_frames("X", "X1_R", 0, 20, on_gaps="ignore")
+    assert find_urls.call_count == 2
+
+    # until the cache is cleared
+    data.find_frames.cache_clear()
+    data.find_frames("X", "X1_R", 0, 10)
+    assert find_urls.call_count == 3
+
+
+def test_find_frames_cache_tmpdir(find_urls, tmp_path):
+    for _ in range(2):
+        data.find_frames("X", "X1_R", 0, 10, tmpdir=str(tmp_path))
+    assert find_urls.call_count == 2
+
+
+def test_find_frames_gaps(find_urls):
+    for _ in range(2):
+        with pytest.warns(UserWarning, match="Missing frames"):
+            data.find_frames("X", "X1_R", 0, 20)
+    assert find_urls.call_count == 1
+    with pytest.raises(RuntimeError, match="Missing frames"):
+        data.find_frames("X", "X1_R", 0, 20, on_gaps="raise")
+    assert find_urls.call_count == 1
@@ -178,13 +178,22 @@ def test_output_segments(pars):
     pars.set('PARAMETER', 'TIMING', '64 4')
     segs = pars.output_segments(0, 100)
     assert segs == [(2, 62), (62, 98)]
+    assert pars.output_segments(0, 124) == [(2, 62), (62, 122)]
+    assert pars.output_segments(0, 4) == []
+    assert all(isinstance(x, int) for seg in segs for x in seg)
 
 
 def test_distribute_segments(pars):
     pars.set('PARAMETER', 'TIMING', '64 4')
     pars.set('PARAMETER', 'PSDLENGTH', '124')
     segs = pars.distribute_segment(0, 1000, nperjob=4)
-    segs == [(0, 604), (600, 1000)]
+    assert segs == [(0, 604), (600, 1000)]
+    assert pars.distribute_segment(0, 1400, nperjob=4) == [
+        (0, 604), (600, 1204), (1200, 1400)]
+    # trailing segment shorter than one chunk is merged into the last job
+    assert pars.distribute_segment(0, 1300, nperjob=4) == [
+        (0, 604), (600, 1300)]
+    assert pars.distribute_segment(0, 200) == [(0, 200)]
 
 
 def test_output_files(pars):
@@ -22,11 +22,14 @@
 import tempfile
 from copy import deepcopy
 from io import StringIO
+from pathlib import Path
 from unittest import mock
 
+import numpy
 import pytest
 
 from gwpy.segments import (DataQualityFlag, Segment, SegmentList)
+from gwpy.timeseries import StateVector
 
 from .. import segments
 
@@ -40,6 +43,33 @@ def seglist():
     ])
 
 
+def test_state_channel():
+    channel, bits, frametype = segments.STATE_CHANNEL["L1:DMT-UP:1"]
+    assert channel == "L1:GDS-CALIB_STATE_VECTOR"
+    with pytest.raises(TypeError):
+        segments.STATE_CHANNEL["X1:TEST:1"] = (channel, bits, frametype)
+
+
+def test_integer_segments():
+    @segments.integer_segments
+    def _segments(segs):
+        return SegmentList(segs)
+
+    segs = _segments([Segment(0.5, 1.9), Segment(2., 4.2)])
+    assert segs == SegmentList([Segment(0, 1), Segment(2, 4)])
+    assert all(isinstance(x, int) for seg in segs for x in seg)
+    assert _segments([]) == SegmentList()
+
+
+@pytest.mark.parametrize("dtype", ("int32", "uint32", "float64"))
+def test_as_uint32(dtype):
+    data = StateVector([0, 1, 3, 2], dtype=dtype, t0=10, dt=1)
+    sv = segments._as_uint32(data)
+    assert sv.dtype == numpy.uint32
+    assert sv.t0 == data.t0
+    numpy.testing.assert_array_equal(sv.value, data.value.astype('uint32'))
+
+
 def test_read_write_segments(seglist):
     with tempfile.NamedTemporaryFile(mode="w") as tmp:
         segments.write_segments(seglist, tmp)
@@ -48,6 +78,32 @@ def test_read_write_segments(seglist):
         assert segs == seglist
 
 
+def test_write_segments(seglist):
+    tmp = StringIO()
+    segments.write_segments(seglist, tmp)
+    ref = StringIO()
+    seglist.write(ref, coltype=int, format="segwizard")
+    assert tmp.getvalue() == ref.getvalue()
+
+
+@pytest.mark.parametrize("content", [
+    "0 1\n1 2\n3 4\n",
+    "# start end duration\n0 1 1\n1 2 1\n3 4 1\n",
+    "; comment\n0\t0\t1\t1.0\n1\t1\t2\t1.0\n2\t3\t4\t1.0\n",
+])
+def test_read_segments(seglist, content):
+    assert segments.read_segments(StringIO(content)) == seglist
+
+
+def test_read_segments_empty():
+    assert segments.read_segments(StringIO("# seg\tstart\tstop\n")) == []
+
+
+def test_read_segments_bad_duration():
+    with pytest.raises(ValueError):
+        segments.read_segments(StringIO("0 1 2\n"))
+
+
 def test_get_last_run_segment(seglist):
     tmp = StringIO()
     segments.write_segments(seglist, tmp)
@@ -55,6 +111,32 @@ def test_get_last_run_segment(seglist):
     assert segments.get_last_run_segment(tmp) == seglist[-1]
 
 
+@pytest.mark.parametrize("blocksize", (8, 4096))
+def test_get_last_run_segment_path(tmp_path, seglist, blocksize):
+    segfile = tmp_path / "segments.txt"
+    segments.write_segments(seglist, segfile)
+    with open(segfile, "a") as fp:
+        fp.write("\n")
+    assert segments.get_last_run_segment(
+        segfile,
+        blocksize=blocksize,
+    ) == seglist[-1]
+
+
+def test_get_last_run_segment_empty(tmp_path):
+    segfile = tmp_path / "segments.txt"
+    segments.write_segments([], segfile)
+    with pytest.raises(IndexError):
+        segments.get_last_run_segment(str(segfile), blocksize=8)
+
+
+def test_get_last_run_segment_bad_duration(tmp_path):
+    segfile = tmp_path / "segments.txt"
+    segfile.write_text("0 0 1 1\n1 3 4 2\n")
+    with pytest.raises(ValueError):
+        segments.get_last_run_segment(segfile)
+
+
 def test_query_state_segments(seglist):
     with mock.patch(
         "omicron.segments.DataQualityFlag.query",
@@ -70,6 +152,60 @@ def test_query_state_segments(seglist):
                              known=[coal.extent()]).pad(1, -1).active
 
 
+@pytest.mark.parametrize("cache, result", [
+    ([], []),
+    (["/path/to/A-B-0-10.gwf", "/path/to/A-B-10-10.gwf",
+      "/path/to/A-B-30-10.gwf"], [(0, 20), (30, 40)]),
+    (["/path/to/A-B-30-10.gwf", "/path/to/A-B-0-10.gwf",
+      "/path/to/A-B-5-20.gwf", "/path/to/A-B-8-2.gwf"], [(0, 25), (30, 40)]),
+])
+def test_cache_segments(cache, result):
+    segs = segments.cache_segments(cache)
+    assert segs == result
+    assert segs == SegmentList(map(segments.file_segment, cache)).coalesce()
+    # non-str entries are parsed with file_segment
+    assert segments.cache_segments(map(Path, cache)) == result
+
+
+@pytest.mark.parametrize("cache, result", [
+    (["A-B-0.5-1.5.txt", "A-B-2-1.xml.gz"], [(0.5, 3)]),
+    (["/path/to/A-B-0-10.h5", "A-B-20-10.root"], [(0, 10), (20, 30)]),
+])
+def test_cache_bounds(cache, result):
+    starts, ends = segments._cache_bounds(cache)
+    assert list(zip(starts, ends)) == result
+
+
+def test_segmentlist_from_tree(tmp_path, seglist):
+    ROOT = pytest.importorskip("ROOT")
+    path = str(tmp_path / "test.root")
+    rfile = ROOT.TFile(path, "recreate")
+    tree = ROOT.TTree("segments", "segments")
+    start = numpy.zeros(1, dtype=float)
+    end = numpy.zeros(1, dtype=float)
+    other = numpy.zeros(1, dtype=float)
+    tree.Branch("start", start, "start/D")
+    tree.Branch("end", end, "end/D")
+    tree.Branch("other", other, "other/D")
+    for seg in seglist:
+        start[0], end[0] = seg
+        tree.Fill()
+    rfile.Write()
+    rfile.Close()
+
+    chain = ROOT.TChain("segments")
+    chain.Add(path)
+    assert segments.segmentlist_from_tree(chain) == seglist
+    assert segments.segmentlist_from_tree(ROOT.TChain("segments")) == []
+
+    # branch status is restored, so a merge keeps all branches
+    assert chain.GetBranchStatus("other")
+    chain.SetBranchStatus("other", 0)
+    assert segments.segmentlist_from_tree(chain) == seglist
+    assert not chain.GetBranchStatus("other")
+    assert chain.GetBranchStatus("start") and chain.GetBranchStatus("end")
+
+
 @mock.patch(
     "omicron.data.find_frames",
     return_value=["/path/to/A-B-0-10.gwf", "/path/to/C-D-20-10.gwf"],
@@ -87,3 +223,9 @@ def test_get_frame_segments(find):
         25,
         100,
     ) == SegmentList([Segment(25, 30)])
+    assert segments.get_frame_segments(
+        "X",
+        "X1_R",
+        10,
+        20,
+    ) == SegmentList()